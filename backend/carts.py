@@ -0,0 +1,84 @@
+"""
+Coffee Shop API - Cart Store
+
+Carts are Redis hashes (product ID -> quantity) shared by every worker process.
+Each write refreshes the cart's expiry and reads the updated items back in the
+same server-side operation.
+"""
+
+import os
+from typing import Dict, Optional
+
+import redis.asyncio as redis
+
+from hot import CART_TTL_SECONDS
+
+
+cart_store = redis.from_url(
+    os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+    decode_responses=True
+)
+
+# Only touch items that are already in the cart, so a concurrent removal is never undone
+SET_ITEM_SCRIPT = cart_store.register_script("""
+if redis.call("HEXISTS", KEYS[1], ARGV[1]) == 0 then
+    return false
+end
+if ARGV[2] == "0" then
+    redis.call("HDEL", KEYS[1], ARGV[1])
+else
+    redis.call("HSET", KEYS[1], ARGV[1], ARGV[2])
+end
+redis.call("EXPIRE", KEYS[1], ARGV[3])
+return redis.call("HGETALL", KEYS[1])
+""")
+
+
+def cart_key(cart_id: str) -> str:
+    """Get the Redis key holding a cart's items."""
+    return f"cart:{cart_id}:items"
+
+
+async def get_cart_items(cart_id: str) -> Dict[str, str]:
+    """Get a cart's items as product ID -> quantity."""
+    return await cart_store.hgetall(cart_key(cart_id))
+
+
+async def add_cart_item(cart_id: str, product_id: str, quantity: int) -> Dict[str, str]:
+    """Increment an item's quantity and return the updated cart items."""
+    key = cart_key(cart_id)
+    async with cart_store.pipeline() as pipe:
+        pipe.hincrby(key, product_id, quantity)
+        pipe.expire(key, CART_TTL_SECONDS)
+        pipe.hgetall(key)
+        results = await pipe.execute()
+    return results[-1]
+
+
+async def set_cart_item(cart_id: str, product_id: str, quantity: int) -> Optional[Dict[str, str]]:
+    """Set an item's quantity, removing it at zero.
+    
+    Returns the updated cart items, or None if the item is not in the cart.
+    """
+    flat_items = await SET_ITEM_SCRIPT(
+        keys=[cart_key(cart_id)],
+        args=[product_id, quantity, CART_TTL_SECONDS]
+    )
+    if flat_items is None:
+        return None
+    
+    # Scripts return HGETALL as a flat [field, value, ...] list
+    return dict(zip(flat_items[::2], flat_items[1::2]))
+
+
+async def remove_cart_item(cart_id: str, product_id: str) -> Optional[Dict[str, str]]:
+    """Remove an item from the cart.
+    
+    Returns the updated cart items, or None if the item is not in the cart.
+    """
+    key = cart_key(cart_id)
+    async with cart_store.pipeline() as pipe:
+        pipe.hdel(key, product_id)
+        pipe.hgetall(key)
+        results = await pipe.execute()
+    return results[1] if results[0] else None
@@ -0,0 +1,88 @@
+"""
+Coffee Shop API - Request Hot Path
+
+CPU-only helpers that run on every product and cart request, together with
+the in-memory product stores they read. The module is fully type annotated so
+it can be compiled with mypyc (see README); main.py imports it the same way
+whether it is compiled or not.
+"""
+
+import logging
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
+from uuid import uuid4
+
+from fastapi import Request, Response
+
+if TYPE_CHECKING:
+    from main import Product
+
+
+logger = logging.getLogger("coffee")
+
+CART_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days, matches the cart cookie
+CART_ID_PATTERN = re.compile(r"[0-9a-f]{32}")  # uuid4().hex, as issued below
+
+# Stores are filled in place by main.load_data, so imported references stay valid
+products_by_id: Dict[str, "Product"] = {}
+product_dicts: Dict[str, Dict[str, Any]] = {}
+
+
+def get_or_create_cart_id(request: Request, response: Response) -> str:
+    """Get cart ID from session cookie or create a new one.
+    
+    Empty carts have no stored state, so any cookie in the issued format is
+    used as-is; anything else is replaced with a fresh ID.
+    """
+    cart_id = request.cookies.get("cart_id")
+    if cart_id is not None and CART_ID_PATTERN.fullmatch(cart_id):
+        return cart_id
+    
+    cart_id = uuid4().hex
+    response.set_cookie(
+        key="cart_id",
+        value=cart_id,
+        max_age=CART_TTL_SECONDS,
+        httponly=True,
+        samesite="lax"
+    )
+    logger.debug("[HOT-get_or_create_cart_id] Created new cart: %s", cart_id)
+    
+    return cart_id
+
+
+def get_product_by_id(product_id: str) -> Optional["Product"]:
+    """Get product by ID."""
+    return products_by_id.get(product_id)
+
+
+def build_cart_response(cart_id: str, items: Mapping[str, str]) -> Dict[str, Any]:
+    """Build cart response from cart data.
+    
+    Items embed the product payloads precomputed in load_data, so the result is
+    plain JSON-ready data matching the Cart schema.
+    """
+    cart_items: List[Dict[str, Any]] = []
+    total_items = 0
+    subtotal = 0.0
+    
+    for product_id, raw_quantity in items.items():
+        product = get_product_by_id(product_id)
+        if product:
+            quantity = int(raw_quantity)
+            item_subtotal = product.price * quantity
+            cart_items.append({
+                "product_id": product_id,
+                "product": product_dicts[product_id],
+                "quantity": quantity,
+                "subtotal": item_subtotal
+            })
+            total_items += quantity
+            subtotal += item_subtotal
+    
+    return {
+        "cart_id": cart_id,
+        "items": cart_items,
+        "total_items": total_items,
+        "subtotal": subtotal
+    }
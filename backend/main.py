@@ -5,15 +5,37 @@ A minimal FastAPI backend implementation for the Coffee Shop Online Store.
 Provides endpoints for product management and shopping cart operations.
 """
 
-import json
-import uuid
+import hashlib
+import logging
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Union
-from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, TypeAdapter
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+from carts import add_cart_item, cart_store, get_cart_items, remove_cart_item, set_cart_item
+from hot import (
+    build_cart_response,
+    get_or_create_cart_id,
+    get_product_by_id,
+    product_dicts,
+    products_by_id,
+)
+
+
+# Logging: per-request messages are DEBUG so they cost nothing, while one-time
+# startup messages (INFO) stay visible
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("coffee")
+logger.setLevel(logging.INFO)
 
 
 # Pydantic Models
@@ -71,20 +93,35 @@ class Cart(BaseModel):
 
 class ProductsResponse(BaseModel):
     """Response model for products endpoint."""
-    products: List[Product]
+    products: Tuple[Product, ...]
     categories: List[Category]
     total: int
     page: int
     per_page: int
 
 
+# Batch validators for loading data files
+product_list_adapter = TypeAdapter(List[Product])
+category_list_adapter = TypeAdapter(List[Category])
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Coffee Shop API",
     description="Backend API for Coffee Shop Online Store",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Rate limiting, per client address. Counters are kept in each worker's memory so
+# the check never blocks the event loop; a client spread over N workers can reach
+# at most N times these limits.
+CATALOG_RATE_LIMIT = "120/minute"
+CART_RATE_LIMIT = "30/minute"
+limiter = Limiter(key_func=get_remote_address)
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -96,118 +133,164 @@ app.add_middleware(
 
 # Data storage
 DATA_DIR = Path(__file__).parent / "data"
-products_data: List[Product] = []
+HEALTH_BODY = orjson.dumps({"status": "healthy"})
+CACHED_PAGE_SIZES = (12, 24, 50)
+products_data: Tuple[Product, ...] = ()
 categories_data: List[Category] = []
-carts: Dict[str, Dict] = {}  # In-memory cart storage
+products_by_category: Dict[str, Tuple[Product, ...]] = {}
+valid_category_ids: FrozenSet[str] = frozenset()
+products_response_cache: Dict[Tuple[Optional[str], int, int], bytes] = {}
+categories_response_bytes: bytes = b"[]"
+catalog_etag: str = ""
+catalog_headers: Dict[str, str] = {}
 
 
 def load_data() -> None:
     """Load product and category data from JSON files."""
     global products_data, categories_data
+    global products_by_category, valid_category_ids
     
     try:
         # Load products
-        with open(DATA_DIR / "coffee.json", "r", encoding="utf-8") as f:
-            coffee_data = json.load(f)
-            products_data = [Product(**product) for product in coffee_data["products"]]
+        coffee_data = orjson.loads((DATA_DIR / "coffee.json").read_bytes())
+        products_data = tuple(product_list_adapter.validate_python(coffee_data["products"]))
         
         # Load categories
-        with open(DATA_DIR / "categories.json", "r", encoding="utf-8") as f:
-            categories_json = json.load(f)
-            categories_data = [Category(**category) for category in categories_json["categories"]]
+        categories_json = orjson.loads((DATA_DIR / "categories.json").read_bytes())
+        categories_data = category_list_adapter.validate_python(categories_json["categories"])
+        
+        # Build lookup indexes for the request-time access patterns
+        # (the hot-path stores are shared with hot.py, so refill them in place)
+        products_by_id.clear()
+        products_by_id.update({product.id: product for product in products_data})
+        product_dicts.clear()
+        product_dicts.update({product.id: product.model_dump() for product in products_data})
+        grouped_products: Dict[str, List[Product]] = defaultdict(list)
+        for product in products_data:
+            grouped_products[product.category].append(product)
+        products_by_category = {category: tuple(products) for category, products in grouped_products.items()}
+        valid_category_ids = frozenset(category.id for category in categories_data)
+        
+        build_response_cache()
             
-        print(f"[MAIN-load_data] Loaded {len(products_data)} products and {len(categories_data)} categories")
+        logger.info("[MAIN-load_data] Loaded %d products and %d categories", len(products_data), len(categories_data))
     except Exception as e:
-        print(f"[MAIN-load_data] Error loading data: {e}")
+        logger.error("[MAIN-load_data] Error loading data: %s", e)
         raise
 
 
-def get_or_create_cart_id(request: Request, response: Response) -> str:
-    """Get cart ID from session cookie or create a new one."""
-    cart_id = request.cookies.get("cart_id")
-    
-    if not cart_id or cart_id not in carts:
-        cart_id = str(uuid.uuid4())
-        carts[cart_id] = {"items": {}, "created_at": datetime.now().isoformat()}
-        response.set_cookie(
-            key="cart_id",
-            value=cart_id,
-            max_age=7 * 24 * 60 * 60,  # 7 days
-            httponly=True,
-            samesite="lax"
-        )
-        print(f"[MAIN-get_or_create_cart_id] Created new cart: {cart_id}")
-    
-    return cart_id
-
-
-def get_product_by_id(product_id: str) -> Optional[Product]:
-    """Get product by ID."""
-    for product in products_data:
-        if product.id == product_id:
-            return product
-    return None
-
-
-def build_cart_response(cart_id: str) -> Cart:
-    """Build cart response from cart data."""
-    cart_data = carts.get(cart_id, {"items": {}})
-    cart_items = []
-    total_items = 0
-    subtotal = 0.0
-    
-    for product_id, item_data in cart_data["items"].items():
-        product = get_product_by_id(product_id)
-        if product:
-            quantity = item_data["quantity"]
-            item_subtotal = product.price * quantity
-            cart_items.append(CartItem(
-                product_id=product_id,
-                product=product,
-                quantity=quantity,
-                subtotal=item_subtotal
-            ))
-            total_items += quantity
-            subtotal += item_subtotal
-    
-    return Cart(
-        cart_id=cart_id,
-        items=cart_items,
-        total_items=total_items,
-        subtotal=subtotal
-    )
+def build_response_cache() -> None:
+    """Pre-serialize catalog responses, which only change when data is reloaded."""
+    global categories_response_bytes, catalog_etag
+    
+    # First pages of the unfiltered and per-category listings, at the page sizes clients use
+    products_response_cache.clear()
+    for category in [None, *(cat.id for cat in categories_data)]:
+        source = products_data if category is None else products_by_category.get(category, ())
+        for per_page in CACHED_PAGE_SIZES:
+            products_response_cache[(category, 1, per_page)] = orjson.dumps(ProductsResponse(
+                products=source[:per_page],
+                categories=categories_data,
+                total=len(source),
+                page=1,
+                per_page=per_page
+            ).model_dump())
+    
+    categories_response_bytes = orjson.dumps([cat.model_dump() for cat in categories_data])
+    
+    # Catalog responses are static between reloads, so one ETag covers them all
+    catalog_bytes = orjson.dumps({
+        "products": [product.model_dump() for product in products_data],
+        "categories": [cat.model_dump() for cat in categories_data]
+    })
+    catalog_etag = f'"{hashlib.md5(catalog_bytes).hexdigest()}"'
+    catalog_headers.clear()
+    catalog_headers.update({"Cache-Control": "public, max-age=300", "ETag": catalog_etag})
+
+
+def is_catalog_fresh(request: Request) -> bool:
+    """Check whether the client already holds the current catalog version.
+    
+    Follows If-None-Match semantics: `*`, comma-separated lists and weak
+    (`W/`-prefixed) tags all match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == catalog_etag:
+            return True
+    return False
 
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    """Load data on startup."""
+    """Load data and check the cart store on startup."""
     load_data()
+    
+    # Fail at startup rather than on the first cart request
+    try:
+        await cart_store.ping()
+    except Exception as e:
+        logger.error("[MAIN-startup_event] Cart store unreachable: %s", e)
+        raise
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the cart store connection pool on shutdown."""
+    await cart_store.aclose()
 
 
 # API Endpoints
+#
+# Handlers stay `async def`, including the catalog ones that never await:
+# FastAPI runs plain `def` handlers through the threadpool, which costs more per
+# request than the coroutine.
 
 @app.get("/api/products", response_model=ProductsResponse)
+@limiter.limit(CATALOG_RATE_LIMIT)
 async def get_products(
+    request: Request,
+    response: Response,
     category: Optional[str] = None,
     page: int = 1,
     per_page: int = 12
-) -> ProductsResponse:
+) -> Union[ProductsResponse, Response]:
     """
     Retrieve a list of all coffee products with optional filtering and pagination.
     
     Args:
+        request: HTTP request object
+        response: HTTP response object
         category: Optional category filter ("beans", "ground", "pods")
         page: Page number for pagination (default: 1)
         per_page: Number of items per page (default: 12, max: 50)
     
     Returns:
-        ProductsResponse containing products, categories, and pagination info
+        ProductsResponse containing products, categories, and pagination info,
+        served from the pre-serialized cache for common queries
     
     Raises:
         HTTPException: If query parameters are invalid
     """
-    print(f"[MAIN-get_products] Fetching products - category: {category}, page: {page}, per_page: {per_page}")
+    logger.debug(
+        "[MAIN-get_products] Fetching products - category: %s, page: %d, per_page: %d",
+        category, page, per_page
+    )
+    
+    # Cached keys are all valid queries, so a hit can skip validation
+    cached = products_response_cache.get((category or None, page, per_page))
+    if cached is not None:
+        if is_catalog_fresh(request):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=catalog_headers)
+        return Response(content=cached, media_type="application/json", headers=catalog_headers)
     
     # Validate pagination parameters
     if page < 1:
@@ -215,15 +298,20 @@ async def get_products(
     if per_page < 1 or per_page > 50:
         raise HTTPException(status_code=400, detail="Per page must be between 1 and 50")
     
-    # Filter products by category if specified
+    # Filter products by category if specified (shared, immutable tuples; no copy)
     filtered_products = products_data
     if category:
         # Validate category exists
-        valid_categories = [cat.id for cat in categories_data]
-        if category not in valid_categories:
-            raise HTTPException(status_code=400, detail=f"Invalid category. Must be one of: {valid_categories}")
+        if category not in valid_category_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid category. Must be one of: {sorted(valid_category_ids)}"
+            )
         
-        filtered_products = [p for p in products_data if p.category == category]
+        filtered_products = products_by_category.get(category, ())
+    
+    if is_catalog_fresh(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=catalog_headers)
     
     # Apply pagination
     total = len(filtered_products)
@@ -231,8 +319,9 @@ async def get_products(
     end_idx = start_idx + per_page
     paginated_products = filtered_products[start_idx:end_idx]
     
-    print(f"[MAIN-get_products] Returning {len(paginated_products)} products out of {total} total")
+    logger.debug("[MAIN-get_products] Returning %d products out of %d total", len(paginated_products), total)
     
+    response.headers.update(catalog_headers)
     return ProductsResponse(
         products=paginated_products,
         categories=categories_data,
@@ -243,12 +332,15 @@ async def get_products(
 
 
 @app.get("/api/products/{product_id}", response_model=Product)
-async def get_product(product_id: str) -> Product:
+@limiter.limit(CATALOG_RATE_LIMIT)
+async def get_product(product_id: str, request: Request, response: Response) -> Union[Product, Response]:
     """
     Retrieve details for a specific product.
     
     Args:
         product_id: Product ID to retrieve
+        request: HTTP request object
+        response: HTTP response object
     
     Returns:
         Product details
@@ -256,34 +348,51 @@ async def get_product(product_id: str) -> Product:
     Raises:
         HTTPException: If product is not found
     """
-    print(f"[MAIN-get_product] Fetching product with ID: {product_id}")
+    logger.debug("[MAIN-get_product] Fetching product with ID: %s", product_id)
     
     product = get_product_by_id(product_id)
     if not product:
-        print(f"[MAIN-get_product] Product not found: {product_id}")
+        logger.debug("[MAIN-get_product] Product not found: %s", product_id)
         raise HTTPException(status_code=404, detail="Product not found")
     
+    if is_catalog_fresh(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=catalog_headers)
+    
+    response.headers.update(catalog_headers)
     return product
 
 
 @app.get("/api/categories", response_model=List[Category])
-async def get_categories() -> List[Category]:
+@limiter.limit(CATALOG_RATE_LIMIT)
+async def get_categories(request: Request) -> Response:
     """
     Retrieve all product categories.
     
+    Args:
+        request: HTTP request object
+    
     Returns:
         List of all categories
     """
-    print(f"[MAIN-get_categories] Returning {len(categories_data)} categories")
-    return categories_data
+    logger.debug("[MAIN-get_categories] Returning %d categories", len(categories_data))
+    if is_catalog_fresh(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=catalog_headers)
+    
+    return Response(content=categories_response_bytes, media_type="application/json", headers=catalog_headers)
 
 
-@app.post("/api/cart", response_model=Cart, status_code=status.HTTP_201_CREATED)
+@app.post(
+    "/api/cart",
+    response_model=None,
+    responses={status.HTTP_201_CREATED: {"model": Cart}},
+    status_code=status.HTTP_201_CREATED
+)
+@limiter.limit(CART_RATE_LIMIT)
 async def add_to_cart(
     item: AddToCartRequest,
     request: Request,
     response: Response
-) -> Cart:
+) -> Dict[str, Any]:
     """
     Add an item to the shopping cart.
     
@@ -298,7 +407,7 @@ async def add_to_cart(
     Raises:
         HTTPException: If product is not found or request is invalid
     """
-    print(f"[MAIN-add_to_cart] Adding product {item.product_id} (qty: {item.quantity}) to cart")
+    logger.debug("[MAIN-add_to_cart] Adding product %s (qty: %d) to cart", item.product_id, item.quantity)
     
     # Validate product exists
     product = get_product_by_id(item.product_id)
@@ -311,21 +420,19 @@ async def add_to_cart(
     # Get or create cart
     cart_id = get_or_create_cart_id(request, response)
     
-    # Add item to cart
-    if item.product_id in carts[cart_id]["items"]:
-        # Update existing item
-        carts[cart_id]["items"][item.product_id]["quantity"] += item.quantity
-    else:
-        # Add new item
-        carts[cart_id]["items"][item.product_id] = {"quantity": item.quantity}
+    # Add item to cart (missing items start at zero)
+    items = await add_cart_item(cart_id, item.product_id, item.quantity)
     
-    print(f"[MAIN-add_to_cart] Added to cart {cart_id}, new quantity: {carts[cart_id]['items'][item.product_id]['quantity']}")
+    logger.debug(
+        "[MAIN-add_to_cart] Added to cart %s, new quantity: %s",
+        cart_id, items[item.product_id]
+    )
     
-    return build_cart_response(cart_id)
+    return build_cart_response(cart_id, items)
 
 
-@app.get("/api/cart", response_model=Cart)
-async def get_cart(request: Request, response: Response) -> Cart:
+@app.get("/api/cart", response_model=None, responses={status.HTTP_200_OK: {"model": Cart}})
+async def get_cart(request: Request, response: Response) -> Dict[str, Any]:
     """
     Retrieve the current shopping cart.
     
@@ -337,18 +444,19 @@ async def get_cart(request: Request, response: Response) -> Cart:
         Current cart contents
     """
     cart_id = get_or_create_cart_id(request, response)
-    print(f"[MAIN-get_cart] Fetching cart: {cart_id}")
+    logger.debug("[MAIN-get_cart] Fetching cart: %s", cart_id)
     
-    return build_cart_response(cart_id)
+    return build_cart_response(cart_id, await get_cart_items(cart_id))
 
 
-@app.put("/api/cart/{item_id}", response_model=Cart)
+@app.put("/api/cart/{item_id}", response_model=None, responses={status.HTTP_200_OK: {"model": Cart}})
+@limiter.limit(CART_RATE_LIMIT)
 async def update_cart_item(
     item_id: str,
     update_data: UpdateCartRequest,
     request: Request,
     response: Response
-) -> Cart:
+) -> Dict[str, Any]:
     """
     Update the quantity of an item in the cart.
     
@@ -364,33 +472,27 @@ async def update_cart_item(
     Raises:
         HTTPException: If item is not in cart or quantity is invalid
     """
-    print(f"[MAIN-update_cart_item] Updating item {item_id} to quantity: {update_data.quantity}")
+    logger.debug("[MAIN-update_cart_item] Updating item %s to quantity: %d", item_id, update_data.quantity)
     
     cart_id = get_or_create_cart_id(request, response)
     
-    # Check if item exists in cart
-    if item_id not in carts[cart_id]["items"]:
+    # Update or remove item (quantity 0 removes it)
+    items = await set_cart_item(cart_id, item_id, update_data.quantity)
+    if items is None:
         raise HTTPException(status_code=404, detail="Item not in cart")
     
-    # Update or remove item
-    if update_data.quantity == 0:
-        # Remove item from cart
-        del carts[cart_id]["items"][item_id]
-        print(f"[MAIN-update_cart_item] Removed item {item_id} from cart")
-    else:
-        # Update quantity
-        carts[cart_id]["items"][item_id]["quantity"] = update_data.quantity
-        print(f"[MAIN-update_cart_item] Updated item {item_id} quantity to {update_data.quantity}")
+    logger.debug("[MAIN-update_cart_item] Updated item %s quantity to %d", item_id, update_data.quantity)
     
-    return build_cart_response(cart_id)
+    return build_cart_response(cart_id, items)
 
 
-@app.delete("/api/cart/{item_id}", response_model=Cart)
+@app.delete("/api/cart/{item_id}", response_model=None, responses={status.HTTP_200_OK: {"model": Cart}})
+@limiter.limit(CART_RATE_LIMIT)
 async def remove_from_cart(
     item_id: str,
     request: Request,
     response: Response
-) -> Cart:
+) -> Dict[str, Any]:
     """
     Remove an item from the cart.
     
@@ -405,28 +507,36 @@ async def remove_from_cart(
     Raises:
         HTTPException: If item is not in cart
     """
-    print(f"[MAIN-remove_from_cart] Removing item {item_id} from cart")
+    logger.debug("[MAIN-remove_from_cart] Removing item %s from cart", item_id)
     
     cart_id = get_or_create_cart_id(request, response)
     
-    # Check if item exists in cart
-    if item_id not in carts[cart_id]["items"]:
+    # Remove item
+    items = await remove_cart_item(cart_id, item_id)
+    if items is None:
         raise HTTPException(status_code=404, detail="Item not in cart")
     
-    # Remove item
-    del carts[cart_id]["items"][item_id]
-    print(f"[MAIN-remove_from_cart] Removed item {item_id} from cart")
+    logger.debug("[MAIN-remove_from_cart] Removed item %s from cart", item_id)
     
-    return build_cart_response(cart_id)
+    return build_cart_response(cart_id, items)
 
 
 # Health check endpoint
 @app.get("/health")
-async def health_check():
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    
+    # Carts live in Redis, so workers can scale to every core unless
+    # WEB_CONCURRENCY says otherwise. uvicorn picks uvloop/httptools when installed.
+    workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers
+    )
\ No newline at end of file
@@ -4,138 +4,157 @@ End-to-End Test Script for Coffee Shop MVP
 Tests the full integration between frontend and backend
 """
 
-import requests
-import time
-import json
+import asyncio
 
-def test_backend_health():
+import httpx
+
+async def check_backend_health(client, lines):
     """Test if backend is responding"""
     try:
-        response = requests.get('http://localhost:8000/health')
+        response = await client.get('http://localhost:8000/health')
         if response.status_code == 200:
-            print("✅ Backend health check passed")
+            lines.append("✅ Backend health check passed")
             return True
         else:
-            print(f"❌ Backend health check failed: {response.status_code}")
+            lines.append(f"❌ Backend health check failed: {response.status_code}")
             return False
     except Exception as e:
-        print(f"❌ Backend not responding: {e}")
+        lines.append(f"❌ Backend not responding: {e}")
         return False
 
-def test_products_api():
+async def check_products_api(client, lines):
     """Test products API endpoint"""
     try:
-        response = requests.get('http://localhost:8000/api/products')
+        response = await client.get('http://localhost:8000/api/products')
         if response.status_code == 200:
             data = response.json()
             products = data.get('products', [])
             categories = data.get('categories', [])
             
-            print(f"✅ Products API working - Found {len(products)} products, {len(categories)} categories")
+            lines.append(f"✅ Products API working - Found {len(products)} products, {len(categories)} categories")
             
             # Test individual product
             if products:
                 product_id = products[0]['id']
-                response = requests.get(f'http://localhost:8000/api/products/{product_id}')
+                response = await client.get(f'http://localhost:8000/api/products/{product_id}')
                 if response.status_code == 200:
-                    print(f"✅ Individual product API working - Product {product_id}")
+                    lines.append(f"✅ Individual product API working - Product {product_id}")
                     return True
                 else:
-                    print(f"❌ Individual product API failed: {response.status_code}")
+                    lines.append(f"❌ Individual product API failed: {response.status_code}")
                     return False
             return True
         else:
-            print(f"❌ Products API failed: {response.status_code}")
+            lines.append(f"❌ Products API failed: {response.status_code}")
             return False
     except Exception as e:
-        print(f"❌ Products API error: {e}")
+        lines.append(f"❌ Products API error: {e}")
         return False
 
-def test_cart_functionality():
+async def check_cart_functionality(client, lines):
     """Test shopping cart operations"""
     try:
-        session = requests.Session()
-        
+        # The client keeps the cart_id cookie between the sequential calls below
         # Add item to cart
         add_payload = {"product_id": "1", "quantity": 2}
-        response = session.post('http://localhost:8000/api/cart', json=add_payload)
+        response = await client.post('http://localhost:8000/api/cart', json=add_payload)
         if response.status_code == 201:
             cart_data = response.json()
-            print(f"✅ Add to cart working - Cart has {cart_data['total_items']} items")
+            lines.append(f"✅ Add to cart working - Cart has {cart_data['total_items']} items")
             
             # Get cart
-            response = session.get('http://localhost:8000/api/cart')
+            response = await client.get('http://localhost:8000/api/cart')
             if response.status_code == 200:
                 cart_data = response.json()
-                print(f"✅ Get cart working - Subtotal: ${cart_data['subtotal']}")
+                lines.append(f"✅ Get cart working - Subtotal: ${cart_data['subtotal']}")
                 
                 # Update quantity
-                response = session.put('http://localhost:8000/api/cart/1', json={"quantity": 3})
+                response = await client.put('http://localhost:8000/api/cart/1', json={"quantity": 3})
                 if response.status_code == 200:
                     cart_data = response.json()
-                    print(f"✅ Update cart working - New quantity: {cart_data['items'][0]['quantity']}")
+                    lines.append(f"✅ Update cart working - New quantity: {cart_data['items'][0]['quantity']}")
                     
                     # Remove item
-                    response = session.delete('http://localhost:8000/api/cart/1')
+                    response = await client.delete('http://localhost:8000/api/cart/1')
                     if response.status_code == 200:
                         cart_data = response.json()
-                        print(f"✅ Remove from cart working - Items remaining: {len(cart_data['items'])}")
+                        lines.append(f"✅ Remove from cart working - Items remaining: {len(cart_data['items'])}")
                         return True
                     else:
-                        print(f"❌ Remove from cart failed: {response.status_code}")
+                        lines.append(f"❌ Remove from cart failed: {response.status_code}")
                         return False
                 else:
-                    print(f"❌ Update cart failed: {response.status_code}")
+                    lines.append(f"❌ Update cart failed: {response.status_code}")
                     return False
             else:
-                print(f"❌ Get cart failed: {response.status_code}")
+                lines.append(f"❌ Get cart failed: {response.status_code}")
                 return False
         else:
-            print(f"❌ Add to cart failed: {response.status_code}")
+            lines.append(f"❌ Add to cart failed: {response.status_code}")
             return False
     except Exception as e:
-        print(f"❌ Cart functionality error: {e}")
+        lines.append(f"❌ Cart functionality error: {e}")
         return False
 
-def test_frontend_connection():
+async def check_frontend_connection(client, lines):
     """Test if frontend is responding"""
     try:
-        response = requests.get('http://localhost:3000')
+        response = await client.get('http://localhost:3000')
         if response.status_code == 200:
             content = response.text
             if "Coffee Shop" in content:
-                print("✅ Frontend is responding and has correct title")
+                lines.append("✅ Frontend is responding and has correct title")
                 return True
             else:
-                print("❌ Frontend responding but missing title")
+                lines.append("❌ Frontend responding but missing title")
                 return False
         else:
-            print(f"❌ Frontend not responding: {response.status_code}")
+            lines.append(f"❌ Frontend not responding: {response.status_code}")
             return False
     except Exception as e:
-        print(f"❌ Frontend connection error: {e}")
+        lines.append(f"❌ Frontend connection error: {e}")
         return False
 
+async def run_test(test_func, client):
+    """Run one test, returning its result and output lines"""
+    # Each test collects its own lines, so concurrent tests don't interleave
+    lines = []
+    return await test_func(client, lines), lines
+
+async def run_tests(tests):
+    """Run the independent tests concurrently, then the cart test on its own"""
+    # One client for every test so calls reuse keep-alive connections
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+    async with httpx.AsyncClient(limits=limits) as client:
+        outcomes = await asyncio.gather(*(run_test(test_func, client) for _, test_func in tests))
+        
+        # The cart test drives one cart through dependent steps, so it runs on its own
+        tests = [*tests, ("Cart Functionality", check_cart_functionality)]
+        outcomes.append(await run_test(check_cart_functionality, client))
+    
+    # Print each test's output under its own heading, in the order listed
+    results = []
+    for (test_name, _), (passed, lines) in zip(tests, outcomes):
+        print(f"\n🔍 Testing: {test_name}")
+        for line in lines:
+            print(line)
+        results.append(passed)
+    return results
+
 def main():
     """Run all end-to-end tests"""
     print("🧪 Starting Coffee Shop MVP End-to-End Tests")
     print("=" * 50)
     
     tests = [
-        ("Backend Health", test_backend_health),
-        ("Products API", test_products_api),
-        ("Cart Functionality", test_cart_functionality),
-        ("Frontend Connection", test_frontend_connection),
+        ("Backend Health", check_backend_health),
+        ("Products API", check_products_api),
+        ("Frontend Connection", check_frontend_connection),
     ]
     
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n🔍 Testing: {test_name}")
-        if test_func():
-            passed += 1
-        time.sleep(0.5)  # Small delay between tests
+    results = asyncio.run(run_tests(tests))
+    passed = sum(results)
+    total = len(results)
     
     print("\n" + "=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")